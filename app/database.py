@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -9,9 +11,48 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 
-engine = create_engine(DATABASE_URL)
+def get_engine_options(url: str) -> dict:
+    """Driver-specific create_engine options for the sync engine"""
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg2":
+        # Send executemany INSERTs as multi-row VALUES pages and batch other executemany
+        # statements (UPDATE/DELETE) through execute_batch
+        return {
+            "executemany_mode": "values_plus_batch",
+            "insertmanyvalues_page_size": 1000,
+            "executemany_batch_page_size": 500,
+        }
+    return {}
+
+engine = create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers; background jobs keep the sync engine
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def get_async_database_url(url: str):
+    """Swap the configured driver for its asyncio counterpart"""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+# aiosqlite runs without a connection pool, so sizing only applies to server databases
+pool_options = {} if ASYNC_DATABASE_URL.get_backend_name() == "sqlite" else {"pool_size": 10, "max_overflow": 20}
+async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True, **pool_options)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling so commits skip the rollback-journal fsyncs"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
 Base = declarative_base()
 
 def get_db():
@@ -19,4 +60,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
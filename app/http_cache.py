@@ -0,0 +1,104 @@
+"""On-disk HTTP cache with ETag / Last-Modified revalidation for feed and article fetches"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class HttpCache:
+    """SQLite store of response bodies and their validators, keyed by URL
+    
+    If the file can't be opened (e.g. an unwritable path) the cache is disabled for
+    the process; lookups then miss and writes are dropped, so fetches fall back to
+    plain GETs.
+    """
+    
+    def __init__(self, path: str, max_age: float):
+        self.path = path
+        self.max_age = max_age  # seconds since last fetch or revalidation before a row is pruned
+        self._lock = threading.Lock()
+        self._ready = False
+        self._unavailable = False
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._unavailable:
+            return None
+        connection = None
+        try:
+            if not self._ready:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            if not self._ready:
+                with self._lock:
+                    if not self._ready:
+                        connection.execute("PRAGMA journal_mode=WAL")
+                        connection.execute(
+                            "CREATE TABLE IF NOT EXISTS http_cache ("
+                            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                            "encoding TEXT, body BLOB NOT NULL, fetched_at REAL NOT NULL)"
+                        )
+                        connection.commit()
+                        self._ready = True
+            return connection
+        except (OSError, sqlite3.Error) as e:
+            if connection is not None:
+                connection.close()
+            self._disable(e)
+            return None
+    
+    def _disable(self, error: Exception):
+        if not self._unavailable:
+            print(f"HTTP cache unavailable at {self.path}, fetching without it: {error}")
+            self._unavailable = True
+    
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], bytes, float]]:
+        """Cached (etag, last_modified, encoding, body, fetched_at) for a URL, or None"""
+        connection = self._connect()
+        if connection is None:
+            return None
+        try:
+            with closing(connection):
+                return connection.execute(
+                    "SELECT etag, last_modified, encoding, body, fetched_at FROM http_cache WHERE url = ?", (url,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"HTTP cache read failed for {url}: {e}")
+            return None
+    
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], encoding: Optional[str], body: bytes):
+        """Store a fresh 200 response"""
+        self._write(
+            "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, encoding, body, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, encoding, body, time.time())
+        )
+    
+    def touch(self, url: str):
+        """Mark a cached body as revalidated by a 304"""
+        self._write("UPDATE http_cache SET fetched_at = ? WHERE url = ?", (time.time(), url))
+    
+    def prune(self):
+        """Drop rows nobody has fetched or revalidated within max_age"""
+        self._write("DELETE FROM http_cache WHERE fetched_at < ?", (time.time() - self.max_age,))
+    
+    def _write(self, statement: str, parameters: tuple):
+        connection = self._connect()
+        if connection is None:
+            return
+        try:
+            with closing(connection), connection:
+                connection.execute(statement, parameters)
+        except sqlite3.Error as e:
+            print(f"HTTP cache write failed: {e}")
+
+
+# One cache file per machine, shared by every collector in the process; feeds are
+# revalidated every run, so only pages that dropped out of them age past a week
+http_cache = HttpCache(
+    os.getenv("HTTP_CACHE_PATH", os.path.expanduser("~/.cache/smb-tracker.sqlite")),
+    max_age=7 * 24 * 3600
+)
@@ -1,10 +1,22 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy.orm import Session
+import asyncio
+import hashlib
+import sys
+from collections import Counter
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, RedirectResponse, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import MutableHeaders
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
 from typing import Optional
 from datetime import datetime
+from pathlib import Path
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import escape
 
-from .database import get_db, engine
+from .database import SessionLocal, get_async_db, engine, AsyncSessionLocal
 from .models import Base, Topic, TopicArticle
 from .topic_collector import TopicNewsCollector
 from .swiss_bias_analyzer import SwissBiasAnalyzer
@@ -15,208 +27,204 @@ Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="Swiss Media Bias Tracker")
 
+STATIC_DIR = Path(__file__).parent / "static"
+ADMIN_PAGE = STATIC_DIR / "admin.html"
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+NOT_MODIFIED_HEADERS = ("cache-control", "expires", "vary")
+ARTICLE_INSERT_BATCH = 25
+ANALYSIS_CONCURRENCY = 10  # matches the Gemini requests-per-minute quota
+ANALYSIS_QUEUE_SIZE = 200
+ARTICLE_FLUSH_SECONDS = 2.0
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """Add caching headers to static files and HTML pages, answering matching If-None-Match with 304"""
+    response = await call_next(request)
+    if request.method != "GET" or response.status_code != 200:
+        return response
+    
+    # StaticFiles already sends ETag/Last-Modified and handles 304s
+    if request.url.path.startswith("/static/"):
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        return response
+    
+    # Only HTML pages are revalidated; JSON API responses stream through untouched
+    if not response.headers.get("content-type", "").startswith("text/html"):
+        return response
+    
+    # File responses carry their own ETag; rendered pages get one from their body
+    etag = response.headers.get("etag")
+    if etag is None:
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        # Copy the raw header list so repeated headers (Set-Cookie) survive
+        headers = MutableHeaders(raw=list(response.raw_headers))
+        headers["ETag"] = etag
+        response = Response(content=body, status_code=response.status_code)
+        response.raw_headers = headers.raw
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        # A 304 must repeat the headers that govern caching of the stored response
+        headers = {"ETag": etag}
+        headers.update((name, response.headers[name]) for name in NOT_MODIFIED_HEADERS if name in response.headers)
+        return Response(status_code=304, headers=headers)
+    
+    return response
+
 # Initialize Swiss-focused services
 topic_collector = TopicNewsCollector()
 bias_analyzer = SwissBiasAnalyzer()
 
+# Badge rules per bias category; pages only ship the rules for categories they show
+BIAS_CSS = {
+    "restrictive": ".bias-badge.restrictive { background: linear-gradient(135deg, #d32f2f, #f44336); color: white; }",
+    "liberal": ".bias-badge.liberal { background: linear-gradient(135deg, #1976d2, #2196f3); color: white; }",
+    "neutral": ".bias-badge.neutral { background: linear-gradient(135deg, #757575, #9e9e9e); color: white; }",
+    "pro_eu": ".bias-badge.pro_eu { background: linear-gradient(135deg, #004494, #1565c0); color: white; }",
+    "eu_skeptical": ".bias-badge.eu_skeptical { background: linear-gradient(135deg, #d52b1e, #f44336); color: white; }",
+    "green_progressive": ".bias-badge.green_progressive { background: linear-gradient(135deg, #388e3c, #4caf50); color: white; }",
+    "conservative_business": ".bias-badge.conservative_business { background: linear-gradient(135deg, #6a4c93, #9c27b0); color: white; }",
+    "left_center": ".bias-badge.left_center { background: linear-gradient(135deg, #e91e63, #f06292); color: white; }",
+    "right_center": ".bias-badge.right_center { background: linear-gradient(135deg, #ff5722, #ff7043); color: white; }",
+}
+
+# Interned translation keys for the known topics and bias categories
+TOPIC_KEYS = {
+    topic_id: sys.intern(f"topics.{topic_id.replace('-', '_')}")
+    for topic_id in topic_collector.get_all_topics()
+}
+BIAS_KEYS = {
+    category: sys.intern(f"bias_categories.{category}")
+    for topic_id in TOPIC_KEYS
+    for category in bias_analyzer.get_bias_categories_for_topic(topic_id)
+}
+
+# Topic counter column for each bias category, keyed by topic; categories come
+# as (side_a, neutral, side_b)
+TOPIC_COUNT_COLUMNS = ("pro_side_a_count", "neutral_count", "pro_side_b_count")
+CATEGORY_BUCKETS = {
+    topic_id: dict(zip(bias_analyzer.get_bias_categories_for_topic(topic_id), TOPIC_COUNT_COLUMNS))
+    for topic_id in TOPIC_KEYS
+}
+DEFAULT_CATEGORY_BUCKETS = dict(zip(("side_a", "neutral", "side_b"), TOPIC_COUNT_COLUMNS))
+
+# Page templates are compiled once at import and rendered per request
+_templates = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_HOMEPAGE_TEMPLATE = _templates.get_template("homepage.html")
+
+# English month names, matching strftime's %b/%B in the C locale without the per-call locale lookup
+MONTHS_SHORT = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+MONTHS_LONG = ("January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December")
+
+def format_short_date(d: datetime) -> str:
+    """Same output as d.strftime('%b %d')"""
+    return f"{MONTHS_SHORT[d.month - 1]} {d.day:02d}"
+
+def format_long_date(d: datetime) -> str:
+    """Same output as d.strftime('%B %d, %Y')"""
+    return f"{MONTHS_LONG[d.month - 1]} {d.day:02d}, {d.year}"
+
+@lru_cache(maxsize=256)
+def source_labels(source: str):
+    """Language tag and short display name for a news source"""
+    return translation_service.detect_article_language(source).upper(), source.split('(')[0].strip()
+
+# Built once: the redirect never changes, and 308 + Cache-Control lets browsers and proxies keep it
+ROOT_REDIRECT = RedirectResponse(url="/en/", status_code=308, headers={"Cache-Control": STATIC_CACHE_CONTROL})
+
 @app.get("/")
 async def root():
     """Redirect to English homepage by default"""
-    return RedirectResponse(url="/en/", status_code=302)
+    return ROOT_REDIRECT
 
 @app.get("/{lang}/", response_class=HTMLResponse)
-async def homepage(lang: str, db: Session = Depends(get_db)):
+async def homepage(lang: str):
     """Multilingual Swiss homepage - simplified version"""
     
     # Validate language
     if lang not in translation_service.SUPPORTED_LANGUAGES:
         raise HTTPException(status_code=404, detail="Language not supported")
     
-    # Get translation function for this language
-    def t(key_path: str) -> str:
-        return translation_service.get_translation(key_path, lang)
-    
-    # Get data
-    topics = db.query(Topic).all()
-    if not topics:
-        initialize_topics(db)
-        topics = db.query(Topic).all()
-    
-    recent_articles = db.query(TopicArticle).order_by(TopicArticle.analyzed_date.desc()).limit(8).all()
+    # Flat translation table for this language
+    tr = translation_service.flat_dict(lang)
+    
+    # Get data - the two independent queries run concurrently on their own sessions
+    async with AsyncSessionLocal() as topics_db, AsyncSessionLocal() as articles_db:
+        topics_result, articles_result = await asyncio.gather(
+            topics_db.execute(select(Topic)),
+            articles_db.execute(
+                select(TopicArticle).options(raiseload('*')).order_by(TopicArticle.analyzed_date.desc()).limit(8)
+            ),
+        )
+        topics = topics_result.scalars().all()
+        if not topics:
+            await topics_db.run_sync(initialize_topics)
+            topics = (await topics_db.execute(select(Topic))).scalars().all()
+        
+        recent_articles = articles_result.scalars().all()
     
-    # Generate article cards HTML
-    article_cards_html = ""
+    # Build card data for the template
+    article_cards = []
     for article in recent_articles:
         # Get translated data
-        topic_key = f"topics.{article.topic_id.replace('-', '_')}"
-        topic_name = t(topic_key)
-        bias_key = f"bias_categories.{article.bias_category or 'neutral'}"
-        bias_display = t(bias_key)
+        topic_key = TOPIC_KEYS.get(article.topic_id) or f"topics.{article.topic_id.replace('-', '_')}"
+        bias_key = BIAS_KEYS.get(article.bias_category or 'neutral') or f"bias_categories.{article.bias_category}"
         
-        # Detect language and source
-        original_lang = translation_service.detect_article_language(article.source).upper()
-        source_name = article.source.split('(')[0].strip()
-        confidence_pct = int((article.confidence or 0) * 100)
+        original_lang, source_name = source_labels(article.source)
         
-        # Format date
-        date_str = article.published_date.strftime('%b %d') if article.published_date else t('common.never')
-        
-        # Truncate title
-        title = article.headline[:85] + "..." if len(article.headline) > 85 else article.headline
-        
-        article_cards_html += f"""
-        <div class="article-card" onclick="window.open('{article.url}', '_blank')">
-            <div class="article-header">
-                <span class="bias-badge {article.bias_category or 'neutral'}">{bias_display}</span>
-                <div class="article-tags">
-                    <span class="language-tag">{original_lang}</span>
-                    <span class="source-tag">{source_name}</span>
-                    <div class="confidence-meter">
-                        <span>{confidence_pct}%</span>
-                        <div class="confidence-bar">
-                            <div class="confidence-fill" style="width: {confidence_pct}%"></div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            <h3 class="article-title">{title}</h3>
-            <div class="article-meta">
-                <span>{date_str}</span> • <span>{topic_name}</span>
-            </div>
-        </div>
-        """
+        article_cards.append({
+            # Feed-supplied links become hrefs; anything but http(s) (e.g. javascript:) is dropped
+            "url": article.url if article.url.startswith(("http://", "https://")) else "#",
+            "bias_category": article.bias_category or 'neutral',
+            "bias_display": tr[bias_key],
+            "original_lang": original_lang,
+            "source_name": source_name,
+            "confidence_pct": int((article.confidence or 0) * 100),
+            "date_str": format_short_date(article.published_date) if article.published_date else tr['common.never'],
+            "title": article.headline[:85] + "..." if len(article.headline) > 85 else article.headline,
+            "topic_name": tr[topic_key],
+        })
     
-    # Generate topic cards HTML
-    topic_cards_html = ""
+    topic_cards = []
     for topic in topics:
-        topic_key = f"topics.{topic.id.replace('-', '_')}"  
-        topic_name = t(topic_key)
-        last_updated = topic.last_processed.strftime('%B %d, %Y') if topic.last_processed else t('common.never')
+        topic_key = TOPIC_KEYS.get(topic.id) or f"topics.{topic.id.replace('-', '_')}"
         
-        topic_cards_html += f"""
-        <div class="topic-card" onclick="location.href='/{lang}/topic/{topic.id}'">
-            <h3>{topic_name}</h3>
-            <div class="topic-stats">
-                <strong>{topic.total_articles}</strong> {t('common.articles_analyzed')}<br>
-                {t('common.last_updated')}: {last_updated}
-            </div>
-        </div>
-        """
+        topic_cards.append({
+            "id": topic.id,
+            "name": tr[topic_key],
+            "total_articles": topic.total_articles,
+            "last_updated": format_long_date(topic.last_processed) if topic.last_processed else tr['common.never'],
+        })
     
-    # Build complete HTML (using double braces for CSS to avoid f-string conflicts)
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="{lang}">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{t('site_title')}</title>
-        <style>
-            body {{ font-family: system-ui, -apple-system, BlinkMacSystemFont, sans-serif; margin: 0; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; }}
-            .container {{ max-width: 1200px; margin: 0 auto; }}
-            .header {{ text-align: center; padding: 40px; background: rgba(255,255,255,0.95); border-radius: 20px; margin-bottom: 40px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }}
-            .header h1 {{ color: #d52b1e; font-size: 2.5rem; margin-bottom: 10px; font-weight: 700; }}
-            .language-switcher {{ position: fixed; top: 20px; right: 20px; background: rgba(255,255,255,0.9); border-radius: 10px; padding: 8px; z-index: 1000; }}
-            .lang-button {{ padding: 8px 12px; margin: 2px; text-decoration: none; color: #666; border-radius: 6px; display: inline-block; font-weight: 600; transition: all 0.2s; }}
-            .lang-button.active {{ background: #d52b1e; color: white; }}
-            .lang-button:hover {{ background: #d52b1e; color: white; }}
-            .main-content {{ display: grid; grid-template-columns: 2fr 1fr; gap: 40px; }}
-            .recent-articles, .topic-overview {{ background: rgba(255,255,255,0.95); border-radius: 20px; padding: 30px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }}
-            .section-title {{ font-size: 1.8rem; margin-bottom: 20px; color: #333; font-weight: 700; }}
-            .article-card {{ background: white; border-radius: 12px; padding: 20px; margin-bottom: 15px; cursor: pointer; box-shadow: 0 4px 15px rgba(0,0,0,0.1); transition: all 0.3s; }}
-            .article-card:hover {{ transform: translateY(-3px); box-shadow: 0 8px 25px rgba(0,0,0,0.15); }}
-            .article-header {{ display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 12px; }}
-            .article-tags {{ display: flex; align-items: center; gap: 8px; }}
-            .bias-badge {{ padding: 6px 12px; border-radius: 15px; font-size: 0.8rem; font-weight: bold; color: white; }}
-            .restrictive {{ background: linear-gradient(135deg, #d32f2f, #f44336); }} 
-            .liberal {{ background: linear-gradient(135deg, #1976d2, #2196f3); }} 
-            .neutral {{ background: linear-gradient(135deg, #757575, #9e9e9e); }}
-            .pro_eu {{ background: linear-gradient(135deg, #004494, #1565c0); }} 
-            .eu_skeptical {{ background: linear-gradient(135deg, #d52b1e, #f44336); }} 
-            .green_progressive {{ background: linear-gradient(135deg, #388e3c, #4caf50); }}
-            .conservative_business {{ background: linear-gradient(135deg, #6a4c93, #9c27b0); }} 
-            .left_center {{ background: linear-gradient(135deg, #e91e63, #f06292); }} 
-            .right_center {{ background: linear-gradient(135deg, #ff5722, #ff7043); }}
-            .language-tag {{ background: #e3f2fd; color: #1565c0; padding: 4px 8px; border-radius: 10px; font-size: 0.75rem; font-weight: bold; }}
-            .source-tag {{ background: #f3e5f5; color: #7b1fa2; padding: 4px 8px; border-radius: 10px; font-size: 0.75rem; font-weight: bold; }}
-            .confidence-meter {{ display: flex; align-items: center; gap: 6px; font-size: 0.8rem; color: #666; }}
-            .confidence-bar {{ width: 50px; height: 4px; background: #eee; border-radius: 2px; overflow: hidden; }}
-            .confidence-fill {{ height: 100%; background: linear-gradient(90deg, #28a745, #20c997); transition: width 0.3s; }}
-            .article-title {{ font-size: 1.1rem; margin-bottom: 8px; color: #333; font-weight: 600; line-height: 1.4; }}
-            .article-meta {{ font-size: 0.9rem; color: #666; }}
-            .topic-card {{ background: white; border-radius: 12px; padding: 20px; margin-bottom: 15px; cursor: pointer; border-left: 4px solid #d52b1e; transition: all 0.3s; box-shadow: 0 4px 15px rgba(0,0,0,0.08); }}
-            .topic-card:hover {{ transform: translateY(-3px); box-shadow: 0 8px 25px rgba(0,0,0,0.15); }}
-            .topic-stats {{ color: #666; font-size: 0.9rem; }}
-            .footer-info {{ margin-top: 30px; padding: 20px; background: #f8f9fa; border-radius: 12px; text-align: center; }}
-            @media (max-width: 768px) {{ 
-                .main-content {{ grid-template-columns: 1fr; }} 
-                .language-switcher {{ position: static; margin-bottom: 20px; text-align: center; }}
-                .header {{ padding: 30px 20px; }}
-                .header h1 {{ font-size: 2rem; }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="language-switcher">
-                <a href="/de/" class="lang-button {'active' if lang == 'de' else ''}">🇩🇪 DE</a>
-                <a href="/fr/" class="lang-button {'active' if lang == 'fr' else ''}">🇫🇷 FR</a>
-                <a href="/it/" class="lang-button {'active' if lang == 'it' else ''}">🇮🇹 IT</a>
-                <a href="/en/" class="lang-button {'active' if lang == 'en' else ''}">🇬🇧 EN</a>
-            </div>
-            
-            <div class="header">
-                <h1>{t('site_title')}</h1>
-                <p style="font-size: 1.2rem; color: #666; margin-bottom: 10px;">{t('tagline')}</p>
-                <p style="font-style: italic; color: #888;">{t('subtitle')}</p>
-            </div>
-            
-            <div class="main-content">
-                <div class="recent-articles">
-                    <h2 class="section-title">📰 {t('nav.recent_analysis')}</h2>
-                    {article_cards_html or '<p style="color: #666; text-align: center; padding: 40px;">No recent articles available</p>'}
-                </div>
-                
-                <div class="topic-overview">
-                    <h2 class="section-title">📋 {t('nav.topics')}</h2>
-                    {topic_cards_html}
-                    
-                    <div class="footer-info">
-                        <h4 style="color: #333; margin-bottom: 15px;">{t('footer.swiss_media_sources')}</h4>
-                        <p style="font-size: 0.85rem; color: #666; line-height: 1.6;">
-                            🇩🇪 <strong>{t('footer.german_speaking')}:</strong> Tages-Anzeiger, NZZ, SRF<br>
-                            🇫🇷 <strong>{t('footer.french_speaking')}:</strong> Le Matin, Le Temps, RTS<br>
-                            🇮🇹 <strong>{t('footer.italian_speaking')}:</strong> Corriere del Ticino, RSI<br>
-                            🇬🇧 <strong>{t('footer.international')}:</strong> SWI swissinfo.ch
-                        </p>
-                        <p style="font-size: 0.8rem; color: #888; margin-top: 15px; font-style: italic;">
-                            {t('footer.powered_by')}<br>
-                            {t('footer.analyzing_regions')}
-                        </p>
-                        <div style="margin-top: 15px;">
-                            <a href="/{lang}/admin" style="color: #d52b1e; text-decoration: none; font-weight: 600;">{t('nav.admin_dashboard')}</a>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    html = _HOMEPAGE_TEMPLATE.render(
+        lang=lang,
+        tr=tr,
+        article_cards=article_cards,
+        topic_cards=topic_cards,
+    )
     
     return HTMLResponse(content=html)
 
 # New topic-based endpoints
 
-@app.get("/api/topics")
-async def get_topics(db: Session = Depends(get_db)):
+@app.get("/api/topics", response_class=ORJSONResponse)
+async def get_topics(db: AsyncSession = Depends(get_async_db)):
     """Get all available topics with their statistics"""
-    topics = db.query(Topic).all()
+    topics = (await db.execute(select(Topic))).scalars().all()
     
     if not topics:
         # Initialize topics if they don't exist
-        initialize_topics(db)
-        topics = db.query(Topic).all()
+        await db.run_sync(initialize_topics)
+        topics = (await db.execute(select(Topic))).scalars().all()
     
     topic_data = []
     for topic in topics:
@@ -224,7 +232,7 @@ async def get_topics(db: Session = Depends(get_db)):
             "id": topic.id,
             "display_name": topic.display_name,
             "total_articles": topic.total_articles,
-            "last_processed": topic.last_processed.isoformat() if topic.last_processed else None,
+            "last_processed": topic.last_processed,
             "distribution": {
                 "pro_side_a": topic.pro_side_a_count,
                 "neutral": topic.neutral_count,
@@ -232,33 +240,34 @@ async def get_topics(db: Session = Depends(get_db)):
             }
         })
     
-    return topic_data
+    # Returned directly so orjson encodes the datetimes, bypassing jsonable_encoder
+    return ORJSONResponse(topic_data)
 
-@app.get("/api/topic/{topic_id}")
+@app.get("/api/topic/{topic_id}", response_class=ORJSONResponse)
 async def get_topic_articles(
     topic_id: str, 
     category: Optional[str] = None,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get articles for a specific topic, optionally filtered by bias category"""
     
     # Verify topic exists
-    topic = db.query(Topic).filter(Topic.id == topic_id).first()
+    topic = await db.get(Topic, topic_id)
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
     # Build query
-    query = db.query(TopicArticle).filter(TopicArticle.topic_id == topic_id)
+    query = select(TopicArticle).options(raiseload('*')).where(TopicArticle.topic_id == topic_id)
     
     if category:
         valid_categories = bias_analyzer.get_bias_categories_for_topic(topic_id)
         if category not in valid_categories:
-            raise HTTPException(status_code=400, detail=f"Invalid category. Valid options: {valid_categories}")
-        query = query.filter(TopicArticle.bias_category == category)
+            raise HTTPException(status_code=400, detail=f"Invalid category. Valid options: {list(valid_categories)}")
+        query = query.where(TopicArticle.bias_category == category)
     
     # Order by most recent first
-    articles = query.order_by(TopicArticle.published_date.desc()).limit(limit).all()
+    articles = (await db.execute(query.order_by(TopicArticle.published_date.desc()).limit(limit))).scalars().all()
     
     # Format response
     article_data = []
@@ -268,7 +277,7 @@ async def get_topic_articles(
             "headline": article.headline,
             "url": article.url,
             "source": article.source,
-            "published_date": article.published_date.isoformat(),
+            "published_date": article.published_date,
             "bias_category": article.bias_category,
             "bias_category_display": bias_analyzer.get_category_display_name(article.bias_category, topic_id) if article.bias_category else None,
             "confidence": article.confidence,
@@ -276,7 +285,7 @@ async def get_topic_articles(
             "key_indicators": article.key_indicators
         })
     
-    return {
+    return ORJSONResponse({
         "topic": {
             "id": topic.id,
             "display_name": topic.display_name,
@@ -284,7 +293,7 @@ async def get_topic_articles(
         },
         "articles": article_data,
         "total_returned": len(article_data)
-    }
+    })
 
 @app.post("/admin/trigger-analysis")
 async def trigger_manual_analysis(
@@ -292,8 +301,7 @@ async def trigger_manual_analysis(
     topic_id: str = "swiss-politics",
     days_back: int = 7,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    end_date: Optional[str] = None
 ):
     """Manual trigger for testing - analyze a topic immediately
     
@@ -310,7 +318,7 @@ async def trigger_manual_analysis(
         raise HTTPException(status_code=400, detail=f"Invalid topic. Valid options: {list(valid_topics.keys())}")
     
     # Start background processing with date range if provided
-    background_tasks.add_task(process_topic_analysis, topic_id, days_back, start_date, end_date, db)
+    background_tasks.add_task(process_topic_analysis, topic_id, days_back, start_date, end_date)
     
     # Generate appropriate message
     if start_date and end_date:
@@ -327,23 +335,42 @@ async def trigger_manual_analysis(
         "message": message
     }
 
+@app.on_event("startup")
+async def recount_statistics_on_startup():
+    """Correct counter drift left by earlier runs (e.g. crashes between insert and increment)"""
+    await asyncio.to_thread(run_statistics_recount)
+
+@app.post("/admin/recount-statistics")
+async def recount_statistics(topic_id: Optional[str] = None):
+    """Recompute topic counters from the stored articles"""
+    await asyncio.to_thread(run_statistics_recount, topic_id)
+    return {"status": "statistics_recounted", "topic_id": topic_id}
+
 @app.get("/topic/{topic_id}")
-async def topic_page(topic_id: str, db: Session = Depends(get_db)):
+async def topic_page(topic_id: str, db: AsyncSession = Depends(get_async_db)):
     """Basic topic page with article listing"""
     
     # Verify topic exists
-    topic = db.query(Topic).filter(Topic.id == topic_id).first()
+    topic = await db.get(Topic, topic_id)
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
     # Get recent articles
-    articles = db.query(TopicArticle).filter(TopicArticle.topic_id == topic_id).order_by(TopicArticle.published_date.desc()).limit(20).all()
-    
-    html_content = f"""
+    articles = (await db.execute(
+        select(TopicArticle).options(raiseload('*')).where(TopicArticle.topic_id == topic_id).order_by(TopicArticle.published_date.desc()).limit(20)
+    )).scalars().all()
+    
+    display_name = escape(topic.display_name)
+    bias_css = "\n".join(
+        BIAS_CSS[category]
+        for category in sorted({article.bias_category or 'neutral' for article in articles})
+        if category in BIAS_CSS
+    )
+    parts = [f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>{topic.display_name} - News Bias Tracker</title>
+        <title>{display_name} - News Bias Tracker</title>
         <style>
             body {{ font-family: Arial, sans-serif; max-width: 1000px; margin: 0 auto; padding: 20px; }}
             .topic-header {{ margin-bottom: 30px; }}
@@ -361,12 +388,13 @@ async def topic_page(topic_id: str, db: Session = Depends(get_db)):
             .filter-buttons {{ margin: 20px 0; }}
             .filter-btn {{ padding: 8px 16px; margin: 5px; border: 1px solid #ddd; background: white; cursor: pointer; }}
             .filter-btn.active {{ background: #007bff; color: white; }}
+            {bias_css}
         </style>
     </head>
     <body>
         <div class="topic-header">
-            <h1>{topic.display_name} Coverage Analysis</h1>
-            <p>{topic.total_articles} articles analyzed • Last updated: {topic.last_processed.strftime('%B %d, %Y') if topic.last_processed else 'Never'}</p>
+            <h1>{display_name} Coverage Analysis</h1>
+            <p>{topic.total_articles} articles analyzed • Last updated: {format_long_date(topic.last_processed) if topic.last_processed else 'Never'}</p>
         </div>
         
         <div class="topic-stats">
@@ -392,33 +420,33 @@ async def topic_page(topic_id: str, db: Session = Depends(get_db)):
         </div>
         
         <div id="articles-container">
-    """
+    """]
     
     # Add articles to HTML
     for article in articles:
-        bias_class = article.bias_category or 'neutral'
+        bias_class = escape(article.bias_category or 'neutral')
         confidence_text = f"({int(article.confidence * 100)}% confidence)" if article.confidence else ""
         
         reasons_html = ""
         if article.analysis_reasons:
-            reasons_html = "<ul>" + "".join([f"<li>{reason}</li>" for reason in article.analysis_reasons[:3]]) + "</ul>"
+            reasons_html = "<ul>" + "".join([f"<li>{escape(reason)}</li>" for reason in article.analysis_reasons[:3]]) + "</ul>"
         
-        html_content += f"""
+        parts.append(f"""
             <div class="article-card" data-category="{bias_class}">
-                <div class="bias-badge {bias_class}">{bias_analyzer.get_category_display_name(bias_class, topic_id)} {confidence_text}</div>
-                <h3>{article.headline}</h3>
+                <div class="bias-badge {bias_class}">{escape(bias_analyzer.get_category_display_name(article.bias_category or 'neutral', topic_id))} {confidence_text}</div>
+                <h3>{escape(article.headline)}</h3>
                 <div class="article-meta">
-                    <strong>{article.source}</strong> • {article.published_date.strftime('%B %d, %Y')}
+                    <strong>{escape(article.source)}</strong> • {format_long_date(article.published_date)}
                 </div>
                 <div class="analysis">
                     <strong>Analysis:</strong>
                     {reasons_html}
                 </div>
-                <a href="{article.url}" target="_blank">Read Original Article →</a>
+                <a href="{escape(article.url)}" target="_blank">Read Original Article →</a>
             </div>
-        """
+        """)
     
-    html_content += """
+    parts.append("""
         </div>
         
         <script>
@@ -442,195 +470,61 @@ async def topic_page(topic_id: str, db: Session = Depends(get_db)):
         </script>
     </body>
     </html>
-    """
+    """)
     
-    return HTMLResponse(content=html_content)
+    return HTMLResponse(content="".join(parts))
 
 @app.get("/admin")
 async def admin_dashboard():
     """Swiss admin interface for manual testing"""
-    html_content = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Swiss Media Admin Dashboard</title>
-        <style>
-            body { 
-                font-family: 'Helvetica Neue', Arial, sans-serif; 
-                max-width: 1000px; 
-                margin: 0 auto; 
-                padding: 20px; 
-                background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-                min-height: 100vh;
-            }
-            .header {
-                text-align: center;
-                margin-bottom: 40px;
-                padding: 30px;
-                background: white;
-                border-radius: 15px;
-                box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            }
-            .header h1 { color: #d52b1e; font-size: 2.5em; margin-bottom: 10px; }
-            .header h1::before { content: "🇨🇭 "; }
-            .topic-section { 
-                margin: 30px 0; 
-                padding: 25px; 
-                background: white;
-                border-radius: 15px;
-                box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-                border-left: 5px solid #d52b1e;
-            }
-            .topic-section h2 {
-                color: #333;
-                font-size: 1.8em;
-                margin-bottom: 20px;
-                font-weight: 400;
-            }
-            button { 
-                background: #d52b1e; 
-                color: white; 
-                padding: 12px 24px; 
-                border: none; 
-                border-radius: 8px; 
-                cursor: pointer; 
-                margin: 8px; 
-                font-size: 1em;
-                transition: all 0.3s;
-            }
-            button:hover { 
-                background: #b71c1c; 
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.2);
-            }
-            .status { 
-                margin: 15px 0; 
-                padding: 15px; 
-                background: #f8f9fa; 
-                border-radius: 8px; 
-                border-left: 4px solid #28a745;
-                font-family: monospace;
-            }
-            .home-link {
-                text-align: center;
-                margin-bottom: 30px;
-            }
-            .home-link a {
-                color: #d52b1e;
-                text-decoration: none;
-                font-weight: bold;
-                font-size: 1.1em;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="home-link">
-            <a href="/">← Back to Swiss Media Tracker</a>
-        </div>
-        
-        <div class="header">
-            <h1>Swiss Media Admin Dashboard</h1>
-            <p>Manually trigger analysis for Swiss topics</p>
-        </div>
-        
-        <div class="topic-section">
-            <h2>🏛️ Immigration & Integration</h2>
-            <button onclick="triggerAnalysis('immigration-integration', 7)">Analyze Last 7 Days</button>
-            <button onclick="triggerAnalysis('immigration-integration', 1)">Analyze Last 24 Hours</button>
-            <div id="status-immigration-integration" class="status"></div>
-        </div>
-        
-        <div class="topic-section">
-            <h2>🇪🇺 EU Relations & Bilateral Agreements</h2>
-            <button onclick="triggerAnalysis('eu-relations', 7)">Analyze Last 7 Days</button>
-            <button onclick="triggerAnalysis('eu-relations', 1)">Analyze Last 24 Hours</button>
-            <div id="status-eu-relations" class="status"></div>
-        </div>
-        
-        <div class="topic-section">
-            <h2>🌿 Climate & Energy Policy</h2>
-            <button onclick="triggerAnalysis('climate-energy', 7)">Analyze Last 7 Days</button>
-            <button onclick="triggerAnalysis('climate-energy', 1)">Analyze Last 24 Hours</button>
-            <div id="status-climate-energy" class="status"></div>
-        </div>
-        
-        <div class="topic-section">
-            <h2>🗳️ Swiss Politics & Elections</h2>
-            <button onclick="triggerAnalysis('swiss-politics', 7)">Analyze Last 7 Days</button>
-            <button onclick="triggerAnalysis('swiss-politics', 1)">Analyze Last 24 Hours</button>
-            <div id="status-swiss-politics" class="status"></div>
-        </div>
-        
-        <div class="topic-section">
-            <h2>📊 View Results</h2>
-            <button onclick="viewTopic('immigration-integration')">Immigration & Integration</button>
-            <button onclick="viewTopic('eu-relations')">EU Relations</button>
-            <button onclick="viewTopic('climate-energy')">Climate & Energy</button>
-            <button onclick="viewTopic('swiss-politics')">Swiss Politics</button>
-        </div>
-
-        <script>
-            async function triggerAnalysis(topicId, daysBack) {
-                const statusDiv = document.getElementById(`status-${topicId}`);
-                statusDiv.innerHTML = `Starting analysis for ${topicId}...`;
-                
-                try {
-                    const response = await fetch('/admin/trigger-analysis', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
-                        body: `topic_id=${topicId}&days_back=${daysBack}`
-                    });
-                    
-                    const data = await response.json();
-                    statusDiv.innerHTML = `✓ ${data.message}`;
-                } catch (error) {
-                    statusDiv.innerHTML = `✗ Error: ${error.message}`;
-                }
-            }
-            
-            function viewTopic(topicId) {
-                window.open(`/topic/${topicId}`, '_blank');
-            }
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html_content)
+    return FileResponse(ADMIN_PAGE, headers={"Cache-Control": "public, max-age=3600"})
 
 def initialize_topics(db: Session):
     """Initialize topics in database if they don't exist"""
     topics_config = topic_collector.get_all_topics()
+    rows = [
+        {
+            "id": topic_id,
+            "display_name": config['display_name'],
+            "keywords": config['keywords'],
+            "sides": config['sides']
+        }
+        for topic_id, config in topics_config.items()
+    ]
+    
+    # One INSERT that skips topics already present
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        existing = set(db.scalars(select(Topic.id).where(Topic.id.in_(topics_config))))
+        rows = [row for row in rows if row["id"] not in existing]
+        if rows:
+            db.execute(insert(Topic), rows)
+        db.commit()
+        return
     
-    for topic_id, config in topics_config.items():
-        existing_topic = db.query(Topic).filter(Topic.id == topic_id).first()
-        if not existing_topic:
-            topic = Topic(
-                id=topic_id,
-                display_name=config['display_name'],
-                keywords=config['keywords'],
-                sides=config['sides']
-            )
-            db.add(topic)
-    
+    db.execute(dialect_insert(Topic).values(rows).on_conflict_do_nothing(index_elements=["id"]))
     db.commit()
 
-async def process_topic_analysis(topic_id: str, days_back: int, start_date: Optional[str] = None, end_date: Optional[str] = None, db: Session = None):
+async def process_topic_analysis(topic_id: str, days_back: int, start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Background task to analyze a topic"""
+    # The task outlives the request, so it opens its own session
+    db = SessionLocal()
     try:
         if start_date and end_date:
             print(f"Starting topic analysis: {topic_id} from {start_date} to {end_date}")
         else:
             print(f"Starting topic analysis: {topic_id} (last {days_back} days)")
         
-        # Get or create topic
-        topic = db.query(Topic).filter(Topic.id == topic_id).first()
-        if not topic:
-            initialize_topics(db)
-            topic = db.query(Topic).filter(Topic.id == topic_id).first()
+        # Get or create topic; the sync session stays off the event loop
+        await asyncio.to_thread(ensure_topic, db, topic_id)
         
         # Collect articles with custom date range if provided
         print("Collecting articles...")
-        articles = topic_collector.collect_articles_for_topic(topic_id, days_back, start_date, end_date)
+        articles = await topic_collector.collect_articles_for_topic(topic_id, days_back, start_date, end_date)
         
         if not articles:
             print("No articles found")
@@ -638,100 +532,205 @@ async def process_topic_analysis(topic_id: str, days_back: int, start_date: Opti
         
         print(f"Processing {len(articles)} articles...")
         
-        # Process each article
-        processed_count = 0
+        # Look up already-stored articles in one query (by content hash)
+        hashes = [article_data['content_hash'] for article_data in articles]
+        seen_hashes = await asyncio.to_thread(find_stored_hashes, db, hashes)
+        
+        # Skip duplicates, including repeats within this run
+        new_articles = []
         for article_data in articles:
-            try:
-                # Check if article already exists (by content hash)
-                existing = db.query(TopicArticle).filter_by(content_hash=article_data['content_hash']).first()
-                if existing:
-                    continue  # Skip duplicates
-                
-                # Analyze bias
-                print(f"Analyzing: {article_data['headline'][:50]}...")
-                bias_result = bias_analyzer.analyze_article_bias(article_data, topic_id)
-                
-                # Save to database
-                topic_article = TopicArticle(
-                    topic_id=topic_id,
-                    headline=article_data['headline'],
-                    content=article_data['content'],
-                    url=article_data['url'],
-                    source=article_data['source'],
-                    published_date=article_data['published_date'],
-                    content_hash=article_data['content_hash'],
-                    bias_category=bias_result['category'],
-                    confidence=bias_result['confidence'],
-                    analysis_reasons=bias_result['main_reasons'],
-                    key_indicators=bias_result['key_indicators'],
-                    analyzed_date=datetime.now(),
-                    gemini_raw_response=bias_result,
-                    processing_status="completed"
-                )
-                
-                db.add(topic_article)
-                processed_count += 1
+            if article_data['content_hash'] in seen_hashes:
+                continue
+            seen_hashes.add(article_data['content_hash'])
+            new_articles.append(article_data)
+        
+        # Every article in this run shares one analysis timestamp
+        analyzed_at = datetime.now()
+        
+        # Pipeline: producer -> bounded queue -> analyzer workers -> writer, so
+        # only a bounded number of articles are in flight at any time and
+        # inserts overlap with the remaining Gemini calls
+        analysis_queue = asyncio.Queue(ANALYSIS_QUEUE_SIZE)
+        result_queue = asyncio.Queue()
+        
+        async def produce():
+            for article_data in new_articles:
+                await analysis_queue.put(article_data)
+            for _ in range(ANALYSIS_CONCURRENCY):
+                await analysis_queue.put(None)
+        
+        async def analyze_worker():
+            # The analyzer's rate limiter keeps calls within the Gemini quota
+            while (article_data := await analysis_queue.get()) is not None:
+                # A bad article is skipped; it must never take the worker down with it
+                try:
+                    print(f"Analyzing: {article_data['headline'][:50]}...")
+                    bias_result = await bias_analyzer.analyze_article_bias(article_data, topic_id)
+                    
+                    await result_queue.put({
+                        "topic_id": topic_id,
+                        "headline": article_data['headline'],
+                        "content": article_data['content'],
+                        "url": article_data['url'],
+                        "source": article_data['source'],
+                        "published_date": article_data['published_date'],
+                        "content_hash": article_data['content_hash'],
+                        "bias_category": bias_result['category'],
+                        "confidence": bias_result['confidence'],
+                        "analysis_reasons": bias_result['main_reasons'],
+                        "key_indicators": bias_result['key_indicators'],
+                        "analyzed_date": analyzed_at,
+                        "gemini_raw_response": bias_result,
+                        "processing_status": "completed"
+                    })
+                except Exception as e:
+                    print(f"Error processing article {article_data['headline'][:30]}: {e}")
+        
+        async def write() -> Counter:
+            # Insert and commit in batches to avoid losing progress; tally the
+            # stored categories for the topic statistics. The blocking commits run
+            # in a worker thread so request handlers aren't stalled meanwhile
+            written = Counter()
+            pending_articles = []
+            while True:
+                try:
+                    row = await asyncio.wait_for(result_queue.get(), ARTICLE_FLUSH_SECONDS)
+                except asyncio.TimeoutError:
+                    # Results are trickling in; flush what we have and keep waiting
+                    if pending_articles:
+                        written.update(await asyncio.to_thread(insert_topic_articles, db, pending_articles))
+                        pending_articles = []
+                    continue
                 
-                # Commit every 5 articles to avoid losing progress
-                if processed_count % 5 == 0:
-                    db.commit()
+                if row is None:
+                    break
                 
-            except Exception as e:
-                print(f"Error processing article {article_data['headline'][:30]}: {e}")
-                continue
+                pending_articles.append(row)
+                if len(pending_articles) >= ARTICLE_INSERT_BATCH:
+                    written.update(await asyncio.to_thread(insert_topic_articles, db, pending_articles))
+                    pending_articles = []
+            
+            # Final batch
+            if pending_articles:
+                written.update(await asyncio.to_thread(insert_topic_articles, db, pending_articles))
+            return written
         
-        # Final commit
-        db.commit()
+        writer = asyncio.create_task(write())
+        stages = [asyncio.create_task(produce())]
+        stages += [asyncio.create_task(analyze_worker()) for _ in range(ANALYSIS_CONCURRENCY)]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            # Whatever happened upstream, stop the stages and let the writer drain
+            # and exit before the session is closed
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            await result_queue.put(None)
+            category_counts = await writer
         
         # Update topic statistics
-        update_topic_statistics(topic_id, db)
+        await asyncio.to_thread(update_topic_statistics, topic_id, db, category_counts, analyzed_at)
         
-        print(f"Completed analysis: {processed_count} articles processed for {topic_id}")
+        print(f"Completed analysis: {sum(category_counts.values())} articles processed for {topic_id}")
         
     except Exception as e:
         print(f"Error in topic analysis {topic_id}: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        db.close()
 
-def update_topic_statistics(topic_id: str, db: Session):
-    """Update Swiss topic statistics after processing"""
-    topic = db.query(Topic).filter(Topic.id == topic_id).first()
-    if not topic:
-        return
-    
-    # Count articles by category
-    articles = db.query(TopicArticle).filter(TopicArticle.topic_id == topic_id).all()
-    
-    category_counts = {"pro_side_a": 0, "neutral": 0, "pro_side_b": 0}
+def ensure_topic(db: Session, topic_id: str):
+    """Create the topic rows if topic_id isn't stored yet"""
+    if db.get(Topic, topic_id) is None:
+        initialize_topics(db)
     
-    # Swiss topic mappings
-    topic_mappings = {
-        "immigration-integration": {"side_a": "restrictive", "side_b": "liberal"},
-        "eu-relations": {"side_a": "pro_eu", "side_b": "eu_skeptical"},
-        "climate-energy": {"side_a": "green_progressive", "side_b": "conservative_business"},
-        "swiss-politics": {"side_a": "left_center", "side_b": "right_center"}
+    # Release the connection back to the pool while collecting
+    db.commit()
+
+def find_stored_hashes(db: Session, hashes: list) -> set:
+    """Content hashes from hashes that are already stored, in one IN query"""
+    seen_hashes = set(db.execute(
+        select(TopicArticle.content_hash).where(TopicArticle.content_hash.in_(hashes))
+    ).scalars())
+    db.commit()
+    return seen_hashes
+
+def insert_topic_articles(db: Session, rows: list) -> list:
+    """Insert analyzed articles with one executemany, isolating bad rows if the batch fails"""
+    # RETURNING hands back the stored categories, so statistics need no re-query
+    statement = insert(TopicArticle).returning(TopicArticle.bias_category)
+    try:
+        categories = db.execute(statement, rows).scalars().all()
+        db.commit()
+        return categories
+    except Exception as e:
+        db.rollback()
+        print(f"Batch insert of {len(rows)} articles failed, retrying row by row: {e}")
+    
+    categories = []
+    for row in rows:
+        try:
+            categories.extend(db.execute(statement, [row]).scalars().all())
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error saving article {row['headline'][:30]}: {e}")
+    
+    return categories
+
+def update_topic_statistics(topic_id: str, db: Session, category_counts: Counter, processed_at: Optional[datetime] = None):
+    """Add newly stored articles to the Swiss topic statistics"""
+    # Increment in SQL so concurrent runs for the same topic don't overwrite each other
+    counters = {
+        column: getattr(Topic, column) + category_counts.get(category, 0)
+        for category, column in CATEGORY_BUCKETS.get(topic_id, DEFAULT_CATEGORY_BUCKETS).items()
     }
-    
-    mapping = topic_mappings.get(topic_id, {"side_a": "side_a", "side_b": "side_b"})
-    
-    for article in articles:
-        if not article.bias_category:
-            continue
-            
-        if article.bias_category == mapping["side_a"]:
-            category_counts["pro_side_a"] += 1
-        elif article.bias_category == "neutral":
-            category_counts["neutral"] += 1
-        elif article.bias_category == mapping["side_b"]:
-            category_counts["pro_side_b"] += 1
-    
-    # Update topic
-    topic.total_articles = len(articles)
-    topic.pro_side_a_count = category_counts["pro_side_a"]
-    topic.neutral_count = category_counts["neutral"]
-    topic.pro_side_b_count = category_counts["pro_side_b"]
-    topic.last_processed = datetime.now()
-    
+    db.execute(
+        update(Topic)
+        .where(Topic.id == topic_id)
+        .values(
+            total_articles=Topic.total_articles + sum(category_counts.values()),
+            last_processed=processed_at or datetime.now(),
+            **counters,
+        )
+    )
+    db.commit()
+
+def run_statistics_recount(topic_id: Optional[str] = None):
+    """Recount topic statistics on a session of its own"""
+    with SessionLocal() as db:
+        recount_topic_statistics(db, topic_id)
+
+def recount_topic_statistics(db: Session, topic_id: Optional[str] = None):
+    """Rebuild topic counters from the stored articles, correcting any drift in the increments"""
+    topic_ids = [topic_id] if topic_id else db.scalars(select(Topic.id)).all()
+    category_counts = {topic: Counter() for topic in topic_ids}
+    
+    query = (
+        select(TopicArticle.topic_id, TopicArticle.bias_category, func.count())
+        .group_by(TopicArticle.topic_id, TopicArticle.bias_category)
+    )
+    if topic_id:
+        query = query.where(TopicArticle.topic_id == topic_id)
+    for topic, category, count in db.execute(query):
+        if topic in category_counts:
+            category_counts[topic][category] = count
+    
+    rows = [
+        {
+            "id": topic,
+            "total_articles": sum(counts.values()),
+            **{
+                column: counts.get(category, 0)
+                for category, column in CATEGORY_BUCKETS.get(topic, DEFAULT_CATEGORY_BUCKETS).items()
+            },
+        }
+        for topic, counts in category_counts.items()
+    ]
+    if rows:
+        db.execute(update(Topic), rows)
     db.commit()
 
 if __name__ == "__main__":
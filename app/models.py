@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -32,8 +33,8 @@ class Author(Base):
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
-    normalized_name = Column(String, nullable=False)  # lowercase, no punctuation for matching
-    byline_variations = Column(JSON)  # Different ways author name appears ["John Smith", "J. Smith"]
+    normalized_name = Column(String, nullable=False, unique=True)  # lowercase, no punctuation for matching
+    byline_variations = Column(JSON().with_variant(JSONB(), "postgresql"))  # Different ways author name appears ["John Smith", "J. Smith"]
     
     # Statistics
     total_articles = Column(Integer, default=0)
@@ -43,25 +44,12 @@ class Author(Base):
     # Bias analysis
     average_bias_confidence = Column(Float, default=0.0)
     
-    # Swiss topic bias counts
-    immigration_restrictive = Column(Integer, default=0)
-    immigration_neutral = Column(Integer, default=0)
-    immigration_liberal = Column(Integer, default=0)
-    
-    eu_relations_pro_eu = Column(Integer, default=0)
-    eu_relations_neutral = Column(Integer, default=0)
-    eu_relations_eu_skeptical = Column(Integer, default=0)
-    
-    climate_green_progressive = Column(Integer, default=0)
-    climate_neutral = Column(Integer, default=0)
-    climate_conservative_business = Column(Integer, default=0)
-    
-    politics_left_center = Column(Integer, default=0)
-    politics_neutral = Column(Integer, default=0)
-    politics_right_center = Column(Integer, default=0)
+    # Swiss topic bias counts, keyed by topic then category:
+    # {"immigration-integration": {"restrictive": 2, "neutral": 5}, "eu-relations": {...}}
+    bias_counts = Column(JSON().with_variant(JSONB(), "postgresql"), default=dict)
     
     # Source affiliations
-    sources = Column(JSON)  # ["CNN", "BBC"] - sources this author writes for
+    sources = Column(JSON().with_variant(JSONB(), "postgresql"))  # ["CNN", "BBC"] - sources this author writes for
     
     # Relationships
     articles = relationship("TopicArticle", back_populates="author")
@@ -80,7 +68,7 @@ class TopicArticle(Base):
     source = Column(String, nullable=False)  # "Tages-Anzeiger", "NZZ", "SRF"
     author_byline = Column(String, nullable=True)
     published_date = Column(DateTime, nullable=False)
-    content_hash = Column(String, nullable=False)
+    content_hash = Column(String, nullable=False, unique=True)
     
     # Multilingual support
     language = Column(String, nullable=True)  # "de", "fr", "it", "en"
@@ -99,4 +87,12 @@ class TopicArticle(Base):
     
     # Relationships
     topic = relationship("Topic", back_populates="articles")
-    author = relationship("Author", back_populates="articles")
\ No newline at end of file
+    author = relationship("Author", back_populates="articles")
+    
+    # Indexes for the listing queries (topic pages, homepage)
+    __table_args__ = (
+        Index("ix_topic_articles_topic_published", topic_id, published_date.desc()),
+        Index("ix_topic_articles_analyzed", analyzed_date.desc()),
+        # Topic page filtered by bias category (/api/topic/{id}?category=), newest first
+        Index("ix_topic_articles_topic_category", topic_id, bias_category, published_date.desc()),
+    )
\ No newline at end of file
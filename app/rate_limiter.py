@@ -0,0 +1,30 @@
+"""Token-bucket rate limiting for Gemini API calls"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Monotonic token bucket; acquire() reserves a token and returns how long to wait for it"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Take a token without sleeping; returns seconds until it is actually available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            
+            # Going negative queues callers behind each other instead of letting them race
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+# Gemini quota is per API key, so every service shares one bucket (10 requests/minute)
+gemini_rate_limiter = TokenBucket(rate=10 / 60, capacity=10)
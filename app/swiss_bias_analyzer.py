@@ -2,53 +2,88 @@
 
 import google.generativeai as genai
 import os
-from typing import Dict, List
-import json
-import time
+from typing import Dict, List, Literal, Tuple
+import re
 import random
+import asyncio
+from .rate_limiter import gemini_rate_limiter
+from string import Template
+from pydantic import BaseModel, TypeAdapter, field_validator
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-class SwissBiasAnalyzer:
-    """Swiss media bias analyzer with multilingual support"""
-    
-    def __init__(self):
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable is required")
-            
-        genai.configure(api_key=api_key)
-        # Use Gemini 1.5 Flash for better multilingual support
-        try:
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-            print("Using Gemini 1.5 Flash for Swiss bias analysis")
-        except:
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            print("Using Gemini 2.0 Flash for Swiss bias analysis")
-        
-        self.last_request_time = 0
-        self.min_delay = 6  # 6 seconds between requests to stay under 10/minute
+# Article content is cut to this many UTF-8 bytes before it goes into a prompt, so
+# the prompt size stays the same for German, French and Italian text
+MAX_PROMPT_CONTENT_BYTES = 3000
+
+
+def truncate_content(content: str, max_bytes: int = MAX_PROMPT_CONTENT_BYTES) -> str:
+    """Truncate text to at most max_bytes of UTF-8 without splitting a character"""
+    # A code point is at most 4 bytes, so short text can't be over the limit
+    if len(content) * 4 <= max_bytes:
+        return content
+    return content.encode('utf-8')[:max_bytes].decode('utf-8', 'ignore')
+
+
+class BiasResult(BaseModel):
+    """Schema of the JSON object Gemini returns for one article"""
     
-    def analyze_article_bias(self, article: Dict, topic_id: str) -> Dict:
-        """
-        Analyze Swiss article bias for specific topic
-        """
-        if topic_id == "immigration-integration":
-            return self._analyze_immigration_bias(article)
-        elif topic_id == "eu-relations":
-            return self._analyze_eu_relations_bias(article)
-        elif topic_id == "climate-energy":
-            return self._analyze_climate_energy_bias(article)
-        elif topic_id == "swiss-politics":
-            return self._analyze_swiss_politics_bias(article)
-        else:
-            raise ValueError(f"Unknown Swiss topic: {topic_id}")
+    category: Literal[
+        "restrictive", "liberal", "pro_eu", "eu_skeptical",
+        "green_progressive", "conservative_business", "left_center", "right_center",
+        "neutral",
+    ]
+    confidence: float
+    main_reasons: List[str]
+    key_indicators: List[str]
     
-    def _analyze_immigration_bias(self, article: Dict) -> Dict:
-        """Analyze Immigration & Integration article for bias"""
-        prompt = f"""
+    @field_validator('confidence')
+    @classmethod
+    def clamp_confidence(cls, value: float) -> float:
+        # Ensure confidence is within range
+        return max(0.0, min(1.0, value))
+
+
+BIAS_RESULT_ADAPTER = TypeAdapter(BiasResult)
+
+
+# Valid bias categories per topic, in side A / neutral / side B order
+BIAS_CATEGORIES = {
+    "immigration-integration": ("restrictive", "neutral", "liberal"),
+    "eu-relations": ("pro_eu", "neutral", "eu_skeptical"),
+    "climate-energy": ("green_progressive", "neutral", "conservative_business"),
+    "swiss-politics": ("left_center", "neutral", "right_center")
+}
+
+CATEGORY_DISPLAY_NAMES = {
+    "immigration-integration": {
+        "restrictive": "Restrictive",
+        "neutral": "Neutral",
+        "liberal": "Liberal"
+    },
+    "eu-relations": {
+        "pro_eu": "Pro-EU",
+        "neutral": "Neutral",
+        "eu_skeptical": "EU-Skeptical"
+    },
+    "climate-energy": {
+        "green_progressive": "Green/Progressive",
+        "neutral": "Neutral",
+        "conservative_business": "Conservative/Business"
+    },
+    "swiss-politics": {
+        "left_center": "Left/Center",
+        "neutral": "Neutral",
+        "right_center": "Right/Center"
+    }
+}
+
+
+# Per-topic analysis prompts; $headline and $content are filled in per article
+PROMPT_TEMPLATES = {
+    "immigration-integration": Template("""
 - You are a Swiss media bias expert. 
 - You have a very important job. You read an article, and find out the bias of the article AS ACCURATELY AS POSSIBLE.
 - You analyze the article for bias in the context of Swiss media, considering cultural and political nuances
@@ -84,22 +119,17 @@ Classify as:
 - "restrictive": Favors tighter immigration controls, security concerns
 - "neutral": Balanced presentation of immigration issues
 - "liberal": Favors open immigration, integration support
-Article Title: {article['headline']}
-Article Content: {article['content'][:3000]}...
+Article Title: $headline
+Article Content: $content...
 Return ONLY valid JSON:
-{{
+{
     "category": "restrictive|neutral|liberal",
     "confidence": 0.8,
     "main_reasons": ["Quotes only SVP politicians", "Uses loaded term 'Überfremdung'"],
     "key_indicators": ["source_imbalance", "loaded_language", "context_omission"]
-}}
-"""
-        
-        return self._get_gemini_analysis(prompt, article['headline'])
-    
-    def _analyze_eu_relations_bias(self, article: Dict) -> Dict:
-        """Analyze EU Relations article for bias"""
-        prompt = f"""
+}
+"""),
+    "eu-relations": Template("""
 Analyze this Swiss article about EU relations and bilateral agreements for bias:
 
 1. PERSPECTIVE BALANCE:
@@ -123,8 +153,8 @@ Analyze this Swiss article about EU relations and bilateral agreements for bias:
    - Swiss neutrality and independence emphasized?
    - Historical context of Swiss-EU relations?
 
-Article Title: {article['headline']}
-Article Content: {article['content'][:3000]}...
+Article Title: $headline
+Article Content: $content...
 
 Classify as:
 - "pro_eu": Favors closer EU integration, bilateral agreements
@@ -132,19 +162,14 @@ Classify as:
 - "eu_skeptical": Emphasizes sovereignty, independence from EU
 
 Return ONLY valid JSON:
-{{
+{
     "category": "pro_eu|neutral|eu_skeptical",
     "confidence": 0.8,
     "main_reasons": ["Emphasizes economic benefits of EU access", "Quotes mainly business leaders"],
     "key_indicators": ["source_selection", "economic_framing", "political_context"]
-}}
-"""
-        
-        return self._get_gemini_analysis(prompt, article['headline'])
-    
-    def _analyze_climate_energy_bias(self, article: Dict) -> Dict:
-        """Analyze Climate & Energy Policy article for bias"""
-        prompt = f"""
+}
+"""),
+    "climate-energy": Template("""
 Analyze this Swiss article about climate and energy policy for bias:
 
 1. PERSPECTIVE BALANCE:
@@ -168,8 +193,8 @@ Analyze this Swiss article about climate and energy policy for bias:
    - Federal vs cantonal energy competencies?
    - Swiss energy independence considerations?
 
-Article Title: {article['headline']}
-Article Content: {article['content'][:3000]}...
+Article Title: $headline
+Article Content: $content...
 
 Classify as:
 - "green_progressive": Favors aggressive climate action, renewable energy
@@ -177,19 +202,14 @@ Classify as:
 - "conservative_business": Emphasizes economic costs, business concerns
 
 Return ONLY valid JSON:
-{{
+{
     "category": "green_progressive|neutral|conservative_business",
     "confidence": 0.8,
     "main_reasons": ["Emphasizes economic costs of carbon tax", "Quotes business leaders extensively"],
     "key_indicators": ["economic_focus", "source_selection", "language_framing"]
-}}
-"""
-        
-        return self._get_gemini_analysis(prompt, article['headline'])
-    
-    def _analyze_swiss_politics_bias(self, article: Dict) -> Dict:
-        """Analyze Swiss Politics article for bias"""
-        prompt = f"""
+}
+"""),
+    "swiss-politics": Template("""
 Analyze this Swiss political article for bias:
 
 1. PARTY REPRESENTATION:
@@ -213,8 +233,8 @@ Analyze this Swiss political article for bias:
    - Federal Council's collegial system explained?
    - Cantonal diversity and federalism considered?
 
-Article Title: {article['headline']}
-Article Content: {article['content'][:3000]}...
+Article Title: $headline
+Article Content: $content...
 
 Classify as:
 - "left_center": Favors SP, Greens, social democratic policies
@@ -222,39 +242,87 @@ Classify as:
 - "right_center": Favors SVP, FDP, conservative/liberal policies
 
 Return ONLY valid JSON:
-{{
+{
     "category": "left_center|neutral|right_center",
     "confidence": 0.8,
     "main_reasons": ["Focuses on SP climate proposals", "Minimal coverage of business concerns"],
     "key_indicators": ["party_balance", "policy_framing", "source_diversity"]
-}}
-"""
+}
+"""),
+}
+
+class SwissBiasAnalyzer:
+    """Swiss media bias analyzer with multilingual support"""
+    
+    # JSON object inside a ``` / ```json fence, else the outermost {...} in the text
+    _FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+    _JSON_RE = re.compile(r'(\{.*\})', re.DOTALL)
+    
+    # Shared, read-only request settings
+    _GEN_CONFIG = genai.types.GenerationConfig(temperature=0.1, max_output_tokens=300)
+    MAX_RETRIES = 3
+    BASE_DELAY = 10  # Base delay for exponential backoff
+    
+    def __init__(self):
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY environment variable is required")
+            
+        genai.configure(api_key=api_key)
+        # Use Gemini 1.5 Flash for better multilingual support
+        try:
+            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            print("Using Gemini 1.5 Flash for Swiss bias analysis")
+        except:
+            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            print("Using Gemini 2.0 Flash for Swiss bias analysis")
         
-        return self._get_gemini_analysis(prompt, article['headline'])
+        # Token bucket shared with every other Gemini caller
+        self.rate_limiter = gemini_rate_limiter
+        
+        # Successful analyses by (topic_id, content_hash), so retried or re-collected
+        # articles don't pay for another Gemini call
+        self.analysis_cache = {}
+        self.max_analysis_entries = 1000
     
-    def _get_gemini_analysis(self, prompt: str, article_title: str) -> Dict:
-        """Get analysis from Gemini API with rate limiting and retry logic"""
-        max_retries = 3
-        base_delay = 10  # Base delay for exponential backoff
+    async def analyze_article_bias(self, article: Dict, topic_id: str) -> Dict:
+        """
+        Analyze Swiss article bias for specific topic
+        """
+        template = PROMPT_TEMPLATES.get(topic_id)
+        if template is None:
+            raise ValueError(f"Unknown Swiss topic: {topic_id}")
+        
+        cache_key = (topic_id, article.get('content_hash'))
+        if cache_key[1] and cache_key in self.analysis_cache:
+            return self.analysis_cache[cache_key]
+        
+        content = truncate_content(article['content'])
+        prompt = template.substitute(headline=article['headline'], content=content)
+        result = await self._get_gemini_analysis(prompt, article['headline'], topic_id)
+        
+        # Failed analyses come back as a neutral fallback; leave those uncached
+        if cache_key[1] and 'rate_limit_error' not in result['key_indicators']:
+            if len(self.analysis_cache) >= self.max_analysis_entries:
+                # Remove oldest entry (first inserted)
+                del self.analysis_cache[next(iter(self.analysis_cache))]
+            self.analysis_cache[cache_key] = result
         
-        for attempt in range(max_retries):
+        return result
+    
+    async def _get_gemini_analysis(self, prompt: str, article_title: str, topic_id: str) -> Dict:
+        """Get analysis from Gemini API with rate limiting and retry logic"""
+        for attempt in range(self.MAX_RETRIES):
             try:
-                # Rate limiting: ensure minimum delay between requests
-                current_time = time.time()
-                time_since_last = current_time - self.last_request_time
-                if time_since_last < self.min_delay:
-                    sleep_time = self.min_delay - time_since_last
-                    print(f"Rate limiting: waiting {sleep_time:.1f}s before next request...")
-                    time.sleep(sleep_time)
-                
-                self.last_request_time = time.time()
+                # Rate limiting: wait for a token without blocking the event loop
+                wait = self.rate_limiter.acquire()
+                if wait:
+                    print(f"Rate limiting: waiting {wait:.1f}s before next request...")
+                    await asyncio.sleep(wait)
                 
-                response = self.model.generate_content(
+                response = await self.model.generate_content_async(
                     prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.1,
-                        max_output_tokens=300,
-                    )
+                    generation_config=self._GEN_CONFIG
                 )
                 
                 print(f"Raw Gemini response for '{article_title[:50]}...': '{response.text}'")
@@ -263,53 +331,44 @@ Return ONLY valid JSON:
                     print("Empty response from Gemini")
                     raise ValueError("Empty response from Gemini")
                 
-                # Clean the response text
-                response_text = response.text.strip()
-                
-                # Sometimes Gemini wraps JSON in code blocks
-                if response_text.startswith('```json'):
-                    response_text = response_text.replace('```json', '').replace('```', '').strip()
-                elif response_text.startswith('```'):
-                    response_text = response_text.replace('```', '').strip()
+                # Sometimes Gemini wraps JSON in code blocks or surrounds it with prose
+                match = self._FENCE_RE.search(response.text) or self._JSON_RE.search(response.text)
+                response_text = match.group(1) if match else response.text.strip()
                 
                 print(f"Cleaned response: '{response_text}'")
                 
-                result = json.loads(response_text)
-                
-                # Validate required fields
-                required_fields = ['category', 'confidence', 'main_reasons', 'key_indicators']
-                for field in required_fields:
-                    if field not in result:
-                        raise ValueError(f"Missing required field: {field}")
+                # Parse and validate in one pass (pydantic-core's JSON parser)
+                result = BIAS_RESULT_ADAPTER.validate_json(response_text).model_dump()
                 
-                # Ensure confidence is within range
-                result['confidence'] = max(0.0, min(1.0, float(result['confidence'])))
+                # The schema accepts every topic's categories; another topic's label is a failed answer
+                if result['category'] not in self.get_bias_categories_for_topic(topic_id):
+                    raise ValueError(f"Category '{result['category']}' is not valid for topic {topic_id}")
                 
                 print(f"Bias analysis for '{article_title[:30]}...': {result['category']} (confidence: {result['confidence']})")
                 return result
             
             except Exception as e:
                 error_str = str(e)
-                print(f"Attempt {attempt + 1}/{max_retries} failed: {error_str}")
+                print(f"Attempt {attempt + 1}/{self.MAX_RETRIES} failed: {error_str}")
                 
                 # Check if it's a rate limit error
                 if "429" in error_str or "quota" in error_str.lower():
-                    if attempt < max_retries - 1:
+                    if attempt < self.MAX_RETRIES - 1:
                         # Exponential backoff with jitter
-                        delay = base_delay * (2 ** attempt) + random.uniform(0, 5)
+                        delay = self.BASE_DELAY * (2 ** attempt) + random.uniform(0, 5)
                         print(f"Rate limit hit, waiting {delay:.1f}s before retry...")
-                        time.sleep(delay)
+                        await asyncio.sleep(delay)
                         continue
                 
                 # Check if it's a JSON parsing error
                 elif "json" in error_str.lower():
-                    if attempt < max_retries - 1:
-                        print(f"JSON parsing failed, retrying in {base_delay}s...")
-                        time.sleep(base_delay)
+                    if attempt < self.MAX_RETRIES - 1:
+                        print(f"JSON parsing failed, retrying in {self.BASE_DELAY}s...")
+                        await asyncio.sleep(self.BASE_DELAY)
                         continue
                 
                 # For other errors, don't retry immediately
-                if attempt == max_retries - 1:
+                if attempt == self.MAX_RETRIES - 1:
                     print(f"All attempts failed for article: {article_title[:30]}...")
                     break
         
@@ -317,44 +376,14 @@ Return ONLY valid JSON:
         return {
             'category': 'neutral',
             'confidence': 0.0,
-            'main_reasons': [f'Analysis failed after {max_retries} attempts - likely rate limited'],
+            'main_reasons': [f'Analysis failed after {self.MAX_RETRIES} attempts - likely rate limited'],
             'key_indicators': ['rate_limit_error']
         }
     
-    def get_bias_categories_for_topic(self, topic_id: str) -> List[str]:
+    def get_bias_categories_for_topic(self, topic_id: str) -> Tuple[str, ...]:
         """Get valid bias categories for a Swiss topic"""
-        categories = {
-            "immigration-integration": ["restrictive", "neutral", "liberal"],
-            "eu-relations": ["pro_eu", "neutral", "eu_skeptical"],
-            "climate-energy": ["green_progressive", "neutral", "conservative_business"],
-            "swiss-politics": ["left_center", "neutral", "right_center"]
-        }
-        
-        return categories.get(topic_id, ["neutral"])
+        return BIAS_CATEGORIES.get(topic_id, ("neutral",))
     
     def get_category_display_name(self, category: str, topic_id: str) -> str:
         """Get human-readable category name"""
-        display_names = {
-            "immigration-integration": {
-                "restrictive": "Restrictive",
-                "neutral": "Neutral", 
-                "liberal": "Liberal"
-            },
-            "eu-relations": {
-                "pro_eu": "Pro-EU",
-                "neutral": "Neutral",
-                "eu_skeptical": "EU-Skeptical"
-            },
-            "climate-energy": {
-                "green_progressive": "Green/Progressive",
-                "neutral": "Neutral",
-                "conservative_business": "Conservative/Business"
-            },
-            "swiss-politics": {
-                "left_center": "Left/Center",
-                "neutral": "Neutral", 
-                "right_center": "Right/Center"
-            }
-        }
-        
-        return display_names.get(topic_id, {}).get(category, category)
\ No newline at end of file
+        return CATEGORY_DISPLAY_NAMES.get(topic_id, {}).get(category, category)
\ No newline at end of file
@@ -2,27 +2,79 @@
 Swiss Translation Service with caching and Gemini integration
 """
 
-import json
+import asyncio
+import orjson
 import os
+import sys
 import hashlib
-from typing import Dict, Optional
+import sqlite3
+import threading
+import re
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from pathlib import Path
 import google.generativeai as genai
 from dotenv import load_dotenv
+from .rate_limiter import gemini_rate_limiter
 
 load_dotenv()
 
+# Original language of each Swiss news source
+SOURCE_LANGUAGES = {
+    "Tages-Anzeiger": "de",
+    "Neue Zürcher Zeitung": "de", 
+    "SRF (Schweizer Radio und Fernsehen)": "de",
+    "Le Matin": "fr",
+    "Le Temps": "fr",
+    "RTS (Radio Télévision Suisse)": "fr",
+    "Corriere del Ticino": "it",
+    "RSI (Radiotelevisione Svizzera)": "it",
+    "SWI swissinfo.ch": "en"
+}
+
+# English language names used in Gemini translation prompts
+LANGUAGE_NAMES = {"de": "German", "fr": "French", "it": "Italian", "en": "English"}
+
+class FlatTranslations(dict):
+    """Flat translation table; unknown keys render as the key path like get_translation"""
+    
+    def __missing__(self, key_path: str) -> str:
+        return key_path
+
+def _flatten_into(flat: Dict[str, str], tree: Dict, prefix: str = ""):
+    """Copy nested translation leaves into flat under dot-notation keys"""
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            _flatten_into(flat, value, f"{prefix}{key}.")
+        else:
+            flat[sys.intern(f"{prefix}{key}")] = value
+
 class SwissTranslationService:
     """Translation service for Swiss Media Bias Tracker"""
     
     SUPPORTED_LANGUAGES = ["en", "de", "fr", "it"]
     DEFAULT_LANGUAGE = "en"
     
+    # Titles sent per Gemini request by translate_titles_batch
+    TITLE_BATCH_SIZE = 25
+    
+    # "3. Translated title" lines in a batch translation response
+    _NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)[.)]\s*(.+?)\s*$')
+    
     def __init__(self):
         self.static_cache = {}  # Pre-loaded UI translations
-        self.dynamic_cache = {} # Article title translations
+        self.dynamic_cache = OrderedDict()  # Article title translations, least recently used first
         self.max_dynamic_entries = 1000  # LRU cache limit
         
+        # Every translation ever made, on disk, so restarts don't pay Gemini again;
+        # the in-memory LRU above stays in front of it for hot titles. Opened on first
+        # use; if it can't be opened, translations are cached in memory only
+        self._db_path = Path(os.getenv("TRANSLATION_CACHE_PATH", os.path.expanduser("~/.cache/smb-tracker-translations.sqlite")))
+        self._db = None
+        self._db_unavailable = False
+        self._db_lock = threading.Lock()
+        
         # Initialize Gemini for dynamic translations
         api_key = os.getenv("GOOGLE_API_KEY")
         if api_key:
@@ -42,20 +94,26 @@ class SwissTranslationService:
         for lang in self.SUPPORTED_LANGUAGES:
             file_path = translations_dir / f"{lang}.json"
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.static_cache[lang] = json.load(f)
+                # orjson decodes the UTF-8 bytes itself, skipping a text-mode read
+                self.static_cache[lang] = orjson.loads(file_path.read_bytes())
                 print(f"✓ Loaded {lang.upper()} translations ({len(self.static_cache[lang])} keys)")
             except FileNotFoundError:
                 print(f"❌ Translation file not found: {file_path}")
                 self.static_cache[lang] = {}
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 print(f"❌ Invalid JSON in {file_path}: {e}")
                 self.static_cache[lang] = {}
+        
+        self._build_flat_tables()
     
     def get_translation(self, key_path: str, lang: str, fallback: str = None) -> str:
         """
         Get static translation by dot-notation key path
         
+        Lookups go through the flattened per-language tables from flat_dict, so
+        static_cache must not be mutated after loading except through
+        load_static_translations().
+        
         Args:
             key_path: Dot notation path like 'nav.recent_analysis' or 'topics.immigration_integration'
             lang: Target language code
@@ -64,32 +122,29 @@ class SwissTranslationService:
         Returns:
             Translated text or fallback
         """
-        if lang not in self.SUPPORTED_LANGUAGES:
-            lang = self.DEFAULT_LANGUAGE
+        # One hash lookup; English fallback is already merged into the table
+        translations = self.flat_dict(lang)
+        if key_path in translations:
+            return translations[key_path]
         
-        # Navigate through nested dictionary
-        try:
-            translation_dict = self.static_cache.get(lang, {})
-            keys = key_path.split('.')
-            
-            for key in keys:
-                translation_dict = translation_dict[key]
-            
-            return translation_dict
-        except (KeyError, TypeError):
-            # Try fallback to English if not default language
+        # Return fallback or key path
+        return fallback or key_path
+    
+    def flat_dict(self, lang: str) -> Mapping[str, str]:
+        """All static translations for a language keyed by dot-notation path, with English fallback"""
+        return self._flat_tables.get(lang) or self._flat_tables[self.DEFAULT_LANGUAGE]
+    
+    def _build_flat_tables(self):
+        """Flatten static_cache into one read-only table per supported language"""
+        tables = {}
+        for lang in self.SUPPORTED_LANGUAGES:
+            flat = FlatTranslations()
+            _flatten_into(flat, self.static_cache.get(self.DEFAULT_LANGUAGE, {}))
             if lang != self.DEFAULT_LANGUAGE:
-                try:
-                    en_dict = self.static_cache.get(self.DEFAULT_LANGUAGE, {})
-                    keys = key_path.split('.')
-                    for key in keys:
-                        en_dict = en_dict[key]
-                    return en_dict
-                except (KeyError, TypeError):
-                    pass
-            
-            # Return fallback or key path
-            return fallback or key_path
+                _flatten_into(flat, self.static_cache.get(lang, {}))
+            # Shared by every request, so callers get a view they can't modify
+            tables[lang] = MappingProxyType(flat)
+        self._flat_tables = tables
     
     def t(self, key_path: str, lang: str = DEFAULT_LANGUAGE) -> str:
         """Shorthand for get_translation"""
@@ -97,18 +152,7 @@ class SwissTranslationService:
     
     def detect_article_language(self, source: str) -> str:
         """Detect original language from Swiss news source"""
-        source_languages = {
-            "Tages-Anzeiger": "de",
-            "Neue Zürcher Zeitung": "de", 
-            "SRF (Schweizer Radio und Fernsehen)": "de",
-            "Le Matin": "fr",
-            "Le Temps": "fr",
-            "RTS (Radio Télévision Suisse)": "fr",
-            "Corriere del Ticino": "it",
-            "RSI (Radiotelevisione Svizzera)": "it",
-            "SWI swissinfo.ch": "en"
-        }
-        return source_languages.get(source, "de")  # Default to German
+        return SOURCE_LANGUAGES.get(source, "de")  # Default to German
     
     async def translate_article_title(self, title: str, source_lang: str, target_lang: str) -> str:
         """
@@ -127,15 +171,17 @@ class SwissTranslationService:
             return title
         
         # Check cache first
-        cache_key = self._generate_cache_key(title, source_lang, target_lang)
-        if cache_key in self.dynamic_cache:
-            return self.dynamic_cache[cache_key]
+        cache_key = (source_lang, target_lang, title)
+        cached = await self._get_cached([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
         
         # Translate using Gemini if available
         if self.gemini_model:
             try:
                 translated = await self._gemini_translate_title(title, source_lang, target_lang)
                 self._add_to_dynamic_cache(cache_key, translated)
+                await asyncio.to_thread(self._persist_translations, [(cache_key, translated)])
                 return translated
             except Exception as e:
                 print(f"Translation failed for '{title[:50]}...': {e}")
@@ -143,14 +189,94 @@ class SwissTranslationService:
         # Return original title if translation fails
         return title
     
+    async def translate_titles_batch(self, titles: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """
+        Translate many article titles with one Gemini request per TITLE_BATCH_SIZE cache misses
+        
+        Args:
+            titles: Original article titles
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated titles in input order; originals where translation fails
+        """
+        if source_lang == target_lang:
+            return list(titles)
+        
+        # Only titles missing from the cache go to Gemini, each once
+        cached = await self._get_cached([(source_lang, target_lang, title) for title in titles])
+        translated = {}
+        misses = {}
+        for title in titles:
+            cache_key = (source_lang, target_lang, title)
+            if cache_key in cached:
+                translated[title] = cached[cache_key]
+            else:
+                misses.setdefault(title, cache_key)
+        
+        if misses and self.gemini_model:
+            pending = list(misses)
+            batches = [pending[i:i + self.TITLE_BATCH_SIZE] for i in range(0, len(pending), self.TITLE_BATCH_SIZE)]
+            results = await asyncio.gather(*(
+                self._gemini_translate_titles(batch, source_lang, target_lang) for batch in batches
+            ), return_exceptions=True)
+            
+            new_entries = []
+            for batch, result in zip(batches, results):
+                if isinstance(result, Exception):
+                    print(f"Batch translation failed for {len(batch)} titles: {result}")
+                    continue
+                for title, translation in zip(batch, result):
+                    # Titles missing from the response stay untranslated and uncached
+                    if translation:
+                        self._add_to_dynamic_cache(misses[title], translation)
+                        new_entries.append((misses[title], translation))
+                        translated[title] = translation
+            
+            # All of this call's translations go to disk in one transaction
+            await asyncio.to_thread(self._persist_translations, new_entries)
+        
+        return [translated.get(title, title) for title in titles]
+    
+    async def _gemini_translate_titles(self, titles: List[str], source_lang: str, target_lang: str) -> List[Optional[str]]:
+        """Use Gemini to translate numbered article titles in one request"""
+        source_lang_name = LANGUAGE_NAMES.get(source_lang, source_lang)
+        target_lang_name = LANGUAGE_NAMES.get(target_lang, target_lang)
+        numbered_titles = "\n".join(f"{number}. {' '.join(title.split())}" for number, title in enumerate(titles, 1))
+        
+        prompt = f"""
+Translate each numbered Swiss news article title from {source_lang_name} to {target_lang_name}.
+Keep the meaning accurate and preserve Swiss political/geographic terms.
+Return ONLY the translations, one per line, with the same numbering, no explanation.
+
+{numbered_titles}
+"""
+        
+        wait = gemini_rate_limiter.acquire()
+        if wait:
+            await asyncio.sleep(wait)
+        
+        response = await self.gemini_model.generate_content_async(
+            prompt,
+            generation_config=genai.types.GenerationConfig(
+                temperature=0.1,
+                max_output_tokens=200 * len(titles),
+            )
+        )
+        
+        # Match lines back by number, so a skipped or merged line can't shift the rest
+        translations = [None] * len(titles)
+        for line in (response.text or "").splitlines():
+            match = self._NUMBERED_LINE_RE.match(line)
+            if match and 1 <= int(match.group(1)) <= len(titles):
+                translations[int(match.group(1)) - 1] = match.group(2)
+        return translations
+    
     async def _gemini_translate_title(self, title: str, source_lang: str, target_lang: str) -> str:
         """Use Gemini to translate article title"""
-        language_map = {
-            "de": "German", "fr": "French", "it": "Italian", "en": "English"
-        }
-        
-        source_lang_name = language_map.get(source_lang, source_lang)
-        target_lang_name = language_map.get(target_lang, target_lang)
+        source_lang_name = LANGUAGE_NAMES.get(source_lang, source_lang)
+        target_lang_name = LANGUAGE_NAMES.get(target_lang, target_lang)
         
         prompt = f"""
 Translate this Swiss news article title from {source_lang_name} to {target_lang_name}.
@@ -160,7 +286,11 @@ Return ONLY the translated title, no explanation.
 Title: {title}
 """
         
-        response = self.gemini_model.generate_content(
+        wait = gemini_rate_limiter.acquire()
+        if wait:
+            await asyncio.sleep(wait)
+        
+        response = await self.gemini_model.generate_content_async(
             prompt,
             generation_config=genai.types.GenerationConfig(
                 temperature=0.1,
@@ -170,26 +300,100 @@ Title: {title}
         
         return response.text.strip() if response.text else title
     
-    def _generate_cache_key(self, title: str, source_lang: str, target_lang: str) -> str:
-        """Generate cache key for translation"""
+    def _persisted_key(self, key: Tuple[str, str, str]) -> str:
+        """Fixed-width on-disk key for a (source_lang, target_lang, title) cache key"""
+        source_lang, target_lang, title = key
         content = f"{source_lang}_{target_lang}_{title}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()
     
-    def _add_to_dynamic_cache(self, key: str, value: str):
-        """Add translation to dynamic cache with LRU eviction"""
-        if len(self.dynamic_cache) >= self.max_dynamic_entries:
-            # Remove oldest entry (first inserted)
-            oldest_key = next(iter(self.dynamic_cache))
-            del self.dynamic_cache[oldest_key]
+    async def _get_cached(self, keys: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], str]:
+        """Cached translations for keys, from memory or else disk (promoting them to memory)"""
+        found = {}
+        missing = []
+        for key in keys:
+            if key in self.dynamic_cache:
+                self.dynamic_cache.move_to_end(key)
+                found[key] = self.dynamic_cache[key]
+            else:
+                missing.append(key)
         
+        if missing:
+            # SQLite blocks; keep it off the event loop
+            for key, value in (await asyncio.to_thread(self._load_persisted, missing)).items():
+                self._add_to_dynamic_cache(key, value)
+                found[key] = value
+        return found
+    
+    def _add_to_dynamic_cache(self, key: Tuple[str, str, str], value: str):
+        """Add translation to dynamic cache with LRU eviction"""
         self.dynamic_cache[key] = value
+        self.dynamic_cache.move_to_end(key)
+        if len(self.dynamic_cache) > self.max_dynamic_entries:
+            # Remove least recently used entry
+            self.dynamic_cache.popitem(last=False)
+    
+    def _cache_db(self) -> Optional[sqlite3.Connection]:
+        """The on-disk cache connection, opened on first use; None if it can't be opened"""
+        if self._db is None and not self._db_unavailable:
+            try:
+                self._db_path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(self._db_path, check_same_thread=False)
+                db.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                db.commit()
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ Translation cache unavailable at {self._db_path}, caching in memory only: {e}")
+                self._db_unavailable = True
+        return self._db
+    
+    def _load_persisted(self, keys: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], str]:
+        """Translations stored on disk for keys (blocking)"""
+        by_persisted_key = {self._persisted_key(key): key for key in keys}
+        with self._db_lock:
+            db = self._cache_db()
+            if db is None:
+                return {}
+            try:
+                # Stay under SQLite's bound-parameter limit
+                persisted_keys = list(by_persisted_key)
+                rows = []
+                for i in range(0, len(persisted_keys), 500):
+                    chunk = persisted_keys[i:i + 500]
+                    rows += db.execute(
+                        f"SELECT key, value FROM translations WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+            except sqlite3.Error as e:
+                print(f"Translation cache read failed: {e}")
+                return {}
+        return {by_persisted_key[persisted_key]: value for persisted_key, value in rows}
+    
+    def _persist_translations(self, entries: List[tuple]):
+        """Write (key, value) translations to the on-disk cache (blocking)"""
+        if not entries:
+            return
+        rows = [(self._persisted_key(key), value) for key, value in entries]
+        with self._db_lock:
+            db = self._cache_db()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.executemany("INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)", rows)
+            except sqlite3.Error as e:
+                print(f"Translation cache write failed: {e}")
     
     def get_cache_stats(self) -> Dict:
         """Get cache statistics for monitoring"""
+        persisted_entries = 0
+        with self._db_lock:
+            if self._db is not None:
+                persisted_entries = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
         return {
             "static_languages": len(self.static_cache),
+            "static_tables": len(self._flat_tables),
             "dynamic_entries": len(self.dynamic_cache),
             "max_dynamic_entries": self.max_dynamic_entries,
+            "persisted_entries": persisted_entries,
             "gemini_available": self.gemini_model is not None
         }
 
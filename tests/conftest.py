@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# The app modules read their configuration at import time, so point every store
+# at a scratch directory before any test imports them
+_scratch = tempfile.mkdtemp(prefix="smb-tracker-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}/test.db"
+os.environ["HTTP_CACHE_PATH"] = f"{_scratch}/http-cache.sqlite"
+os.environ["TRANSLATION_CACHE_PATH"] = f"{_scratch}/translations.sqlite"
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def db():
+    """A session on a fresh in-memory SQLite database"""
+    from app.models import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
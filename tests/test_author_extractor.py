@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy import event
+
+from app.author_extractor import AuthorExtractor
+from app.models import Author
+
+
+def count_selects(db):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    return statements
+
+
+def test_find_or_create_authors_batches_lookup_and_insert(db):
+    extractor = AuthorExtractor()
+    created = extractor.find_or_create_authors([
+        ("Anna Muster", "NZZ"),
+        ("anna muster", "Tages-Anzeiger"),
+        ("Peter Keller", "SRF"),
+    ], db)
+    db.commit()
+
+    assert set(created) == {"anna muster", "peter keller"}
+    anna = db.query(Author).filter_by(normalized_name="anna muster").one()
+    assert anna.sources == ["NZZ", "Tages-Anzeiger"]
+    assert anna.byline_variations == ["Anna Muster", "anna muster"]
+
+    # A fresh session finds existing authors with one IN query and inserts only the new one
+    db.expunge_all()
+    db.info.clear()
+    selects = count_selects(db)
+    found = extractor.find_or_create_authors([
+        ("Anna Muster", "Blick"),
+        ("Lea Frei", "Blick"),
+    ], db)
+    db.commit()
+
+    assert found["anna muster"].id == created["anna muster"].id
+    assert found["anna muster"].sources == ["NZZ", "Tages-Anzeiger", "Blick"]
+    assert db.query(Author).count() == 3
+    assert len([s for s in selects if "FROM authors" in s and " IN " in s]) == 1
+
+
+def test_author_cache_is_reset_on_rollback(db):
+    extractor = AuthorExtractor()
+    first = extractor.find_or_create_author("Anna Muster", "NZZ", db)
+    assert db.info["_author_cache"] == {"anna muster": first}
+
+    db.rollback()
+    assert db.info["_author_cache"] == {}
+
+    # The rolled-back row is gone, so the author is created again instead of served from the cache
+    second = extractor.find_or_create_author("Anna Muster", "NZZ", db)
+    db.commit()
+    assert second is not first
+    assert db.query(Author).count() == 1
+
+
+def test_author_insert_requires_on_conflict_support():
+    class MySQLSession:
+        def get_bind(self):
+            return type("Bind", (), {"dialect": type("Dialect", (), {"name": "mysql"})})()
+
+    with pytest.raises(NotImplementedError):
+        AuthorExtractor()._insert_authors_statement(MySQLSession())
+
+
+def test_bias_stats_accumulator_flushes_deltas(db):
+    from app.author_extractor import BiasStatsAccumulator
+
+    extractor = AuthorExtractor()
+    authors = extractor.find_or_create_authors([("Anna Muster", "NZZ"), ("Peter Keller", "SRF")], db)
+    anna, peter = authors["anna muster"], authors["peter keller"]
+
+    accumulator = BiasStatsAccumulator()
+    accumulator.add(anna, "eu-relations", "pro_eu", 0.8)
+    accumulator.add(anna, "eu-relations", "pro_eu", 0.6)
+    accumulator.add(anna, "climate-energy", "neutral", 0.4)
+    accumulator.add(peter, "eu-relations", "eu_skeptical", 0.9)
+    accumulator.add(peter, "unknown-topic", "other", 0.5)  # untracked pairs only bump the totals
+    accumulator.flush(db)
+    db.commit()
+
+    db.refresh(anna)
+    db.refresh(peter)
+    assert anna.total_articles == 3
+    assert abs(anna.average_bias_confidence - 0.6) < 1e-9
+    assert anna.bias_counts == {"eu-relations": {"pro_eu": 2}, "climate-energy": {"neutral": 1}}
+    assert peter.total_articles == 2
+    assert peter.bias_counts == {"eu-relations": {"eu_skeptical": 1}}
+
+    # A second flush adds to the stored counters instead of overwriting them
+    accumulator.add(anna, "eu-relations", "pro_eu", 0.6)
+    accumulator.flush(db)
+    db.commit()
+    db.refresh(anna)
+    assert anna.total_articles == 4
+    assert anna.bias_counts["eu-relations"] == {"pro_eu": 3}
+    assert extractor.get_author_bias_summary(anna, "eu-relations")["distribution"] == {
+        "pro_eu": 3, "neutral": 0, "eu_skeptical": 0
+    }
+
+
+def test_update_author_bias_stats_matches_accumulator(db):
+    extractor = AuthorExtractor()
+    author = extractor.find_or_create_author("Anna Muster", "NZZ", db)
+
+    extractor.update_author_bias_stats(author, "swiss-politics", "left_center", 0.7)
+    extractor.update_author_bias_stats(author, "swiss-politics", "left_center", 0.5)
+    db.commit()
+
+    db.refresh(author)
+    assert author.total_articles == 2
+    assert abs(author.average_bias_confidence - 0.6) < 1e-9
+    assert author.bias_counts == {"swiss-politics": {"left_center": 2}}
@@ -0,0 +1,120 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_homepage_revalidates_with_etag():
+    response = client.get("/en/")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    revalidated = client.get("/en/", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+
+
+def test_not_modified_keeps_cache_headers():
+    response = client.get("/admin")
+    assert response.status_code == 200
+
+    revalidated = client.get("/admin", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == response.headers["cache-control"]
+
+
+def test_api_responses_are_not_buffered_for_etags():
+    response = client.get("/api/topics")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+def test_article_links_are_escaped_attributes():
+    from app.main import _HOMEPAGE_TEMPLATE
+    from app.translation_service import translation_service
+
+    html = _HOMEPAGE_TEMPLATE.render(
+        lang="en",
+        tr=translation_service.flat_dict("en"),
+        article_cards=[{
+            "url": "https://example.ch/a?x=');alert(1);//\"",
+            "bias_category": "neutral",
+            "bias_display": "Neutral",
+            "original_lang": "DE",
+            "source_name": "NZZ",
+            "confidence_pct": 80,
+            "date_str": "Jan 1",
+            "title": "Title",
+            "topic_name": "Topic",
+        }],
+        topic_cards=[],
+    )
+
+    assert 'href="https://example.ch/a?x=&#39;);alert(1);//&#34;"' in html
+    assert "window.open" not in html
+
+
+def test_recount_topic_statistics_corrects_drift(db):
+    from datetime import datetime
+
+    from app.main import recount_topic_statistics
+    from app.models import Topic, TopicArticle
+
+    db.add(Topic(
+        id="eu-relations", display_name="EU", keywords=[], sides=[],
+        total_articles=10, pro_side_a_count=7, neutral_count=2, pro_side_b_count=1,
+    ))
+    db.add(Topic(id="climate-energy", display_name="Climate", keywords=[], sides=[], total_articles=4, neutral_count=4))
+    for index, category in enumerate(["pro_eu", "pro_eu", "neutral", "eu_skeptical"]):
+        db.add(TopicArticle(
+            topic_id="eu-relations", url=f"https://example.ch/{index}", headline="Headline", content="Text",
+            content_hash=f"hash-{index}",
+            source="NZZ", published_date=datetime(2025, 1, 1), bias_category=category, confidence=0.5,
+        ))
+    db.commit()
+
+    recount_topic_statistics(db)
+
+    eu = db.get(Topic, "eu-relations")
+    db.refresh(eu)
+    assert (eu.total_articles, eu.pro_side_a_count, eu.neutral_count, eu.pro_side_b_count) == (4, 2, 1, 1)
+    climate = db.get(Topic, "climate-energy")
+    db.refresh(climate)
+    assert (climate.total_articles, climate.neutral_count) == (0, 0)
+
+
+def test_process_topic_analysis_skips_stored_articles(monkeypatch):
+    import asyncio
+    from datetime import datetime
+
+    from app import main
+    from app.models import Topic, TopicArticle
+
+    def article(index):
+        return {
+            "headline": f"Headline {index}", "content": "Text", "url": f"https://example.ch/pipeline-{index}",
+            "source": "NZZ", "published_date": datetime(2025, 1, 1), "content_hash": f"pipeline-{index}",
+        }
+
+    async def collect(topic_id, days_back, start_date=None, end_date=None):
+        return [article(1), article(2), article(2)]
+
+    async def analyze(article_data, topic_id):
+        return {"category": "pro_eu", "confidence": 0.8, "main_reasons": [], "key_indicators": []}
+
+    monkeypatch.setattr(main.topic_collector, "collect_articles_for_topic", collect)
+    monkeypatch.setattr(main.bias_analyzer, "analyze_article_bias", analyze)
+
+    asyncio.run(main.process_topic_analysis("eu-relations", 7))
+    asyncio.run(main.process_topic_analysis("eu-relations", 7))
+
+    with main.SessionLocal() as db:
+        hashes = db.scalars(
+            main.select(TopicArticle.content_hash).where(TopicArticle.content_hash.like("pipeline-%"))
+        ).all()
+        topic = db.get(Topic, "eu-relations")
+        assert sorted(hashes) == ["pipeline-1", "pipeline-2"]
+        assert (topic.total_articles, topic.pro_side_a_count) == (2, 2)
@@ -0,0 +1,53 @@
+import asyncio
+
+from app.swiss_bias_analyzer import SwissBiasAnalyzer
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.calls += 1
+        return FakeResponse(self.responses.pop(0))
+
+
+def analyze(analyzer, topic_id):
+    article = {"headline": "Bilaterale III", "content": "Text", "content_hash": f"hash-{topic_id}"}
+    return asyncio.run(analyzer.analyze_article_bias(article, topic_id))
+
+
+def make_analyzer(responses):
+    analyzer = SwissBiasAnalyzer()
+    analyzer.model = FakeModel(responses)
+    analyzer.rate_limiter = type("NoLimit", (), {"acquire": staticmethod(lambda: 0)})()
+    return analyzer
+
+
+def test_category_from_another_topic_fails_the_analysis():
+    answer = '{"category": "restrictive", "confidence": 0.9, "main_reasons": [], "key_indicators": []}'
+    analyzer = make_analyzer([answer] * SwissBiasAnalyzer.MAX_RETRIES)
+
+    result = analyze(analyzer, "eu-relations")
+
+    assert result["key_indicators"] == ["rate_limit_error"]
+    assert result["confidence"] == 0.0
+    assert analyzer.model.calls == SwissBiasAnalyzer.MAX_RETRIES
+    assert analyzer.analysis_cache == {}
+
+
+def test_category_valid_for_topic_is_accepted():
+    answer = '```json\n{"category": "pro_eu", "confidence": 1.4, "main_reasons": ["a"], "key_indicators": ["b"]}\n```'
+    analyzer = make_analyzer([answer])
+
+    result = analyze(analyzer, "eu-relations")
+
+    assert result["category"] == "pro_eu"
+    assert result["confidence"] == 1.0
+    assert ("eu-relations", "hash-eu-relations") in analyzer.analysis_cache
@@ -0,0 +1,58 @@
+import asyncio
+
+from app.topic_collector import TopicNewsCollector
+
+
+def test_extracted_articles_are_cached_per_query_string():
+    collector = TopicNewsCollector()
+    pages = {
+        "https://example.ch/article?id=1": "<html><body><article><p>" + "Erster Artikel. " * 20 + "</p></article></body></html>",
+        "https://example.ch/article?id=2": "<html><body><article><p>" + "Zweiter Artikel. " * 20 + "</p></article></body></html>",
+    }
+    fetched = []
+
+    async def fetch_text(session, url, max_age=0):
+        fetched.append(url)
+        return pages[url]
+
+    collector._fetch_text = fetch_text
+
+    async def extract(url):
+        return await collector._extract_full_article(None, url)
+
+    first = asyncio.run(extract("https://example.ch/article?id=1"))
+    second = asyncio.run(extract("https://example.ch/article?id=2"))
+    again = asyncio.run(extract("https://example.ch/article?id=1#comments"))
+
+    assert first.startswith("Erster Artikel")
+    assert second.startswith("Zweiter Artikel")
+    assert again == first
+    assert fetched == ["https://example.ch/article?id=1", "https://example.ch/article?id=2"]
+
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<item><title>Bilaterale Vertraege mit der EU</title><link>https://example.ch/eu-1</link><description></description></item>
+<item><title>Neue Runde zur EU-Personenfreizuegigkeit</title><link>https://example.ch/eu-2</link><description></description></item>
+</channel></rss>"""
+
+
+def test_failed_extractions_release_seen_urls():
+    collector = TopicNewsCollector()
+
+    async def fetch(session, url, max_age=0):
+        return FEED
+
+    async def extract(session, url):
+        return "Artikeltext. " * 20 if url.endswith("eu-1") else None
+
+    collector._fetch = fetch
+    collector._extract_full_article = extract
+
+    seen_urls = set()
+    articles = asyncio.run(collector._collect_from_rss(
+        None, "test", {"name": "Test", "rss_feeds": ["https://example.ch/feed"]}, "eu-relations", 7, seen_urls
+    ))
+
+    assert [article["url"] for article in articles] == ["https://example.ch/eu-1"]
+    assert seen_urls == {"https://example.ch/eu-1"}
@@ -0,0 +1,28 @@
+from types import MappingProxyType
+
+import pytest
+
+from app.translation_service import SwissTranslationService
+
+
+def test_flat_tables_are_read_only_and_fall_back():
+    service = SwissTranslationService()
+    table = service.flat_dict("de")
+
+    assert isinstance(table, MappingProxyType)
+    assert table["no.such.key"] == "no.such.key"
+    assert service.flat_dict("xx") is service.flat_dict("en")
+    with pytest.raises(TypeError):
+        table["site_title"] = "changed"
+
+
+def test_rebuilt_tables_reflect_static_cache():
+    service = SwissTranslationService()
+    before = service.flat_dict("fr")
+
+    service.static_cache["fr"] = {"site_title": "Titre"}
+    service._build_flat_tables()
+
+    assert service.flat_dict("fr") is not before
+    assert service.flat_dict("fr")["site_title"] == "Titre"
+    assert service.get_translation("site_title", "fr") == "Titre"